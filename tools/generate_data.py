@@ -7,32 +7,67 @@ including demographics, comorbidities, and simulated survival times.
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm, gamma, binom, uniform
+from scipy import special
 import os
+import math
+import argparse
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-def generate_correlated_variables(n, mean1, std1, mean2, std2, correlation):
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; pandas' CSV writer is used instead
+    pa = None
+
+# Rows generated per step; keeps each sampler's working set (output slice plus
+# temporaries) within L2/L3 cache instead of streaming full columns through memory
+CHUNK_SIZE = 2**16
+
+def _chunks(n):
+    """Yield consecutive slices of at most CHUNK_SIZE covering range(n)."""
+    for start in range(0, n, CHUNK_SIZE):
+        yield slice(start, min(start + CHUNK_SIZE, n))
+
+def generate_correlated_variables(rng, n, mean1, std1, mean2, std2, correlation, out=None):
     """
     Generate two correlated normally distributed variables.
     
     Args:
+        rng: numpy Generator used to draw the samples
         n: Number of samples
         mean1, std1: Parameters for first variable
         mean2, std2: Parameters for second variable  
         correlation: Desired correlation coefficient (-1 to 1)
+        out: Optional float32 array of shape (2, n) to fill instead of allocating
     """
-    # Generate uncorrelated variables
-    x1 = np.random.normal(0, 1, n)
-    x2 = np.random.normal(0, 1, n)
+    if out is None:
+        out = np.empty((2, n), dtype=np.float32)
+    x1, x2 = out
+    
+    # Generate uncorrelated float32 variables; everything below updates them in place
+    rng.standard_normal(out=x1, dtype=np.float32)
+    rng.standard_normal(out=x2, dtype=np.float32)
     
     # Create correlation
-    x2 = correlation * x1 + np.sqrt(1 - correlation**2) * x2
+    x2 *= math.sqrt(1.0 - correlation * correlation)
+    x2 += correlation * x1
     
     # Transform to desired distributions
-    var1 = x1 * std1 + mean1
-    var2 = x2 * std2 + mean2
+    x2 *= std2
+    x2 += mean2
+    x1 *= std1
+    x1 += mean1
     
-    return var1, var2
+    return x1, x2
+
+def _gamma_variates(rng, shape, scale, out):
+    """Fill the float32 array out with Gamma(shape, scale) variates, scaling in place."""
+    for sl in _chunks(len(out)):
+        chunk = out[sl]
+        rng.standard_gamma(shape, out=chunk, dtype=np.float32)
+        chunk *= np.float32(scale)
 
 def generate_synthetic_data(
     num_samples=1000,
@@ -44,6 +79,7 @@ def generate_synthetic_data(
     survival_shape=2.0,            # Survival time gamma shape
     survival_scale=5.0,            # Survival time gamma scale
     correlated_vars=None,          # Dict with correlation parameters
+    survival_los_corr=0.0,         # Gaussian-copula correlation of length of stay and survival time
     random_seed=42
 ):
     """
@@ -60,81 +96,183 @@ def generate_synthetic_data(
                 'correlation': float (-1 to 1)
             }
     """
-    np.random.seed(random_seed)
-    
-    # Initialize data dictionary
-    data_dict = {}
+    # Comorbidities
+    if comorbidity_list is None:
+        comorbidity_list = ["diabetes", "hypertension", "cancer"]
+    if comorbidity_prevalences is None:
+        comorbidity_prevalences = [0.2, 0.3, 0.05]  # Adjust as desired
+    comorbidity_list = list(comorbidity_list)[:len(comorbidity_prevalences)]
+
+    # Preallocate one contiguous float32 buffer for the continuous columns and one
+    # uint8 buffer for the Bernoulli flags (event flag last), one row per column
+    if correlated_vars:
+        leading_names = [correlated_vars['var1']['name'], correlated_vars['var2']['name']]
+    else:
+        leading_names = ["weight"]
+    float_names = leading_names + ["length_of_stay", "survival_time"]
+    floats = np.empty((len(float_names), num_samples), dtype=np.float32)
+    flags = np.empty((len(comorbidity_list) + 1, num_samples), dtype=np.uint8)
+    ages = None
+    columns = dict(zip(float_names, floats))
+
+    # Each sampler fills one group of independent columns from its own Generator
+    samplers = []
     
     # Handle correlated variables if specified
     if correlated_vars:
-        var1, var2 = generate_correlated_variables(
-            num_samples,
-            correlated_vars['var1']['mean'],
-            correlated_vars['var1']['std'],
-            correlated_vars['var2']['mean'],
-            correlated_vars['var2']['std'],
-            correlated_vars['correlation']
-        )
-        data_dict[correlated_vars['var1']['name']] = var1
-        data_dict[correlated_vars['var2']['name']] = var2
+        def sample_correlated(rng):
+            for sl in _chunks(num_samples):
+                generate_correlated_variables(
+                    rng,
+                    sl.stop - sl.start,
+                    correlated_vars['var1']['mean'],
+                    correlated_vars['var1']['std'],
+                    correlated_vars['var2']['mean'],
+                    correlated_vars['var2']['std'],
+                    correlated_vars['correlation'],
+                    out=floats[:2, sl]
+                )
+        samplers.append(sample_correlated)
     else:
         # Generate independent variables as before
-        data_dict["age"] = norm.rvs(loc=age_params[0], scale=age_params[1], size=num_samples).astype(int)
-        data_dict["weight"] = norm.rvs(loc=weight_params[0], scale=weight_params[1], size=num_samples)
+        ages = np.empty(num_samples, dtype=np.int16)
+        
+        def sample_age(rng):
+            # Round ages in a reused chunk buffer before casting into the int16 column
+            buf = np.empty(min(num_samples, CHUNK_SIZE))
+            for sl in _chunks(num_samples):
+                draws = buf[:sl.stop - sl.start]
+                rng.standard_normal(out=draws)
+                draws *= age_params[1]
+                draws += age_params[0]
+                np.rint(draws, out=draws)
+                ages[sl] = draws
+        
+        def sample_weight(rng):
+            for sl in _chunks(num_samples):
+                weight = columns["weight"][sl]
+                rng.standard_normal(out=weight, dtype=np.float32)
+                weight *= weight_params[1]
+                weight += weight_params[0]
+        samplers += [sample_age, sample_weight]
     
     # Hospital-related variable: length of stay
-    data_dict["length_of_stay"] = gamma.rvs(a=length_of_stay_params[0],
-                                           scale=length_of_stay_params[1],
-                                           size=num_samples)
+    def sample_length_of_stay(rng):
+        _gamma_variates(rng, length_of_stay_params[0], length_of_stay_params[1], columns["length_of_stay"])
     
-    # Comorbidities
-    if comorbidity_list is None:
-        comorbidity_list = ["diabetes", "hypertension", "cancer"]
-    if comorbidity_prevalences is None:
-        comorbidity_prevalences = [0.2, 0.3, 0.05]  # Adjust as desired
-
-    # Build comorbidity data
-    for comorbidity, prevalence in zip(comorbidity_list, comorbidity_prevalences):
-        data_dict[comorbidity] = binom.rvs(n=1, p=prevalence, size=num_samples)
+    # Correlated length of stay and survival time: a Gaussian copula maps one pair of
+    # correlated standard normals through both gamma quantile functions (upper-tail
+    # form, which stays finite for large z)
+    def sample_stay_and_survival(rng):
+        c = math.sqrt(1.0 - survival_los_corr * survival_los_corr)
+        z = np.empty((2, min(num_samples, CHUNK_SIZE)))
+        for sl in _chunks(num_samples):
+            z0, z1 = z[0, :sl.stop - sl.start], z[1, :sl.stop - sl.start]
+            rng.standard_normal(out=z0)
+            rng.standard_normal(out=z1)
+            z1 *= c
+            z1 += survival_los_corr * z0
+            targets = ((z0, length_of_stay_params, "length_of_stay"),
+                       (z1, (survival_shape, survival_scale), "survival_time"))
+            for row, (shape, scale), name in targets:
+                q = special.ndtr(np.negative(row, out=row), out=row)
+                special.gammainccinv(shape, q, out=q)
+                np.multiply(q, scale, out=columns[name][sl], casting='same_kind')
+    
+    # Build comorbidity and event flags from a single uniform draw: one row per
+    # Bernoulli column, thresholded against its probability (event rate last).
+    # This is several times faster than rng.binomial(1, prev, size=...) even with
+    # a broadcast probability array, since binomial pays its sampler cost per draw
+    def sample_flags(rng):
+        prev = np.asarray(list(comorbidity_prevalences)[:len(comorbidity_list)] + [0.3], dtype=np.float32)
+        buf = np.empty(len(prev) * min(num_samples, CHUNK_SIZE), dtype=np.float32)
+        bits = flags.view(np.bool_)
+        for sl in _chunks(num_samples):
+            u = buf[:len(prev) * (sl.stop - sl.start)].reshape(len(prev), -1)
+            rng.random(out=u, dtype=np.float32)
+            np.less(u, prev[:, None], out=bits[:, sl])
+    
+    # Survival time
+    def sample_survival_time(rng):
+        _gamma_variates(rng, survival_shape, survival_scale, columns["survival_time"])
     
-    # Survival time and event occurrence
-    data_dict["survival_time"] = gamma.rvs(a=survival_shape, scale=survival_scale, size=num_samples)
-    data_dict["event_occurred"] = binom.rvs(n=1, p=0.3, size=num_samples)
+    if survival_los_corr:
+        samplers += [sample_stay_and_survival, sample_flags]
+    else:
+        samplers += [sample_length_of_stay, sample_flags, sample_survival_time]
+    
+    # Spawn non-overlapping child streams and run the samplers concurrently;
+    # numpy releases the GIL while filling the buffers
+    seeds = np.random.SeedSequence(random_seed).spawn(len(samplers))
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda sampler, seed: sampler(np.random.default_rng(seed)), samplers, seeds))
+    
+    # Assemble the columns in their usual order as views on the two buffers
+    data_dict = {}
+    if ages is not None:
+        data_dict["age"] = ages
+    for name in leading_names + ["length_of_stay"]:
+        data_dict[name] = columns[name]
+    data_dict.update(zip(comorbidity_list, flags[:-1]))
+    data_dict["survival_time"] = columns["survival_time"]
+    data_dict["event_occurred"] = flags[-1]
     
-    return pd.DataFrame(data_dict)
+    # Build the frame in one shot without copying the buffers. The private
+    # DataFrame._from_arrays path is not used: it consolidates (copies) same-dtype
+    # columns, whereas the dict constructor with copy=False keeps these views
+    return pd.DataFrame(data_dict, copy=False)
+
+@lru_cache(maxsize=1)
+def _ensure_output_dir():
+    """Create data/generated_data once per process and return its path."""
+    output_dir = "data/generated_data"
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
+@lru_cache(maxsize=1)
+def _today():
+    """Date stamp used in default filenames, computed once per process."""
+    return datetime.date.today().strftime("%Y%m%d")
 
-def export_synthetic_data(df, filename=None):
+def export_synthetic_data(df, filename=None, fmt='csv'):
     """
-    Exports the synthetic medical data to a CSV file in the data/generated_data directory.
+    Exports the synthetic medical data to a CSV or Parquet file in the data/generated_data directory.
     The filename includes the current date if no filename is provided.
     
     Args:
         df: pandas DataFrame containing the synthetic medical data
-        filename: name of the CSV file to create (default: None, will use date-based name)
+        filename: name of the file to create (default: None, will use date-based name)
+        fmt: output format, 'csv' (default) or 'parquet' (Snappy-compressed)
     """
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported export format: {fmt}")
+    
     # Create data/generated_data directory if it doesn't exist
-    output_dir = "data/generated_data"
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = _ensure_output_dir()
     
     # Generate default filename with date if none provided
     if filename is None:
-        today = datetime.date.today().strftime("%Y%m%d")
-        filename = f"synthetic_medical_data_{today}.csv"
+        filename = f"synthetic_medical_data_{_today()}.{fmt}"
     else:
-        # Add .csv extension if not present
-        if not filename.endswith('.csv'):
-            filename = f"{filename}.csv"
+        # Add the format's extension if not present
+        if not filename.endswith(f'.{fmt}'):
+            filename = f"{filename}.{fmt}"
     
     # Construct full output path
     output_path = os.path.join(output_dir, filename)
     
-    # Export to CSV
-    df.to_csv(output_path, index=False)
+    if fmt == 'parquet':
+        df.to_parquet(output_path, index=False, compression='snappy')
+    elif pa is not None:
+        # Arrow's multi-threaded C++ writer is much faster than pandas' row-wise formatter
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), output_path)
+    else:
+        df.to_csv(output_path, index=False, chunksize=CHUNK_SIZE)
     print(f"Data exported to {output_path}")
 
 
-if __name__ == "__main__":
-    # Get parameters via user input
+def prompt_parameters():
+    """Ask for the generation parameters on stdin (the --interactive mode)."""
     samples = int(input("Enter number of samples to generate (default: 2000): ") or "2000")
     filename = input("Enter output filename (press Enter for date-based name): ") or None
     survival_shape = float(input("Enter shape parameter for survival time distribution (default: 2.0): ") or "2.0")
@@ -160,12 +298,70 @@ if __name__ == "__main__":
     else:
         corr_params = None
     
+    params = {
+        'num_samples': samples,
+        'survival_shape': survival_shape,
+        'survival_scale': survival_scale,
+        'correlated_vars': corr_params,
+    }
+    return params, filename
+
+def parse_args(argv=None):
+    """Parse command-line options; defaults match the interactive prompts."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic medical dataset.")
+    parser.add_argument('--samples', type=int, default=2000, help="number of samples to generate")
+    parser.add_argument('--filename', default=None, help="output filename (default: date-based name)")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help="output file format")
+    parser.add_argument('--survival-shape', type=float, default=2.0, help="survival time gamma shape")
+    parser.add_argument('--survival-scale', type=float, default=5.0, help="survival time gamma scale")
+    parser.add_argument('--survival-los-corr', type=float, default=0.0,
+                        help="copula correlation between length of stay and survival time")
+    parser.add_argument('--var1', nargs=3, metavar=('NAME', 'MEAN', 'STD'),
+                        help="first correlated variable (replaces age and weight)")
+    parser.add_argument('--var2', nargs=3, metavar=('NAME', 'MEAN', 'STD'), help="second correlated variable")
+    parser.add_argument('--correlation', type=float, default=0.0,
+                        help="correlation coefficient between --var1 and --var2 (-1 to 1)")
+    parser.add_argument('--seed', type=int, default=42, help="random seed")
+    parser.add_argument('--interactive', action='store_true', help="prompt for parameters instead")
+    args = parser.parse_args(argv)
+    
+    if (args.var1 is None) != (args.var2 is None):
+        parser.error("--var1 and --var2 must be given together")
+    for option in ('var1', 'var2'):
+        spec = getattr(args, option)
+        if spec is not None:
+            try:
+                setattr(args, option, {'name': spec[0], 'mean': float(spec[1]), 'std': float(spec[2])})
+            except ValueError:
+                parser.error(f"--{option} MEAN and STD must be numbers")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    
+    if args.interactive:
+        params, filename = prompt_parameters()
+    else:
+        corr_params = None
+        if args.var1 is not None:
+            corr_params = {'var1': args.var1, 'var2': args.var2, 'correlation': args.correlation}
+        params = {
+            'num_samples': args.samples,
+            'survival_shape': args.survival_shape,
+            'survival_scale': args.survival_scale,
+            'correlated_vars': corr_params,
+        }
+        filename = args.filename
+    
     # Generate data with specified parameters
     df = generate_synthetic_data(
-        num_samples=samples,
-        survival_shape=survival_shape, 
-        survival_scale=survival_scale,
-        correlated_vars=corr_params
+        survival_los_corr=args.survival_los_corr,
+        random_seed=args.seed,
+        **params
     )
     print(df.head(10))
-    export_synthetic_data(df, filename=filename)
\ No newline at end of file
+    export_synthetic_data(df, filename=filename, fmt=args.format)
+
+
+if __name__ == "__main__":
+    main()